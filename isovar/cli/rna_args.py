@@ -22,7 +22,10 @@ from pysam import AlignmentFile
 
 from varcode.cli import make_variants_parser, variant_collection_from_args
 
-from ..default_parameters import MIN_READ_MAPPING_QUALITY
+from ..default_parameters import (
+    MIN_READ_MAPPING_QUALITY,
+    DECOMPRESSION_THREADS,
+)
 
 from ..read_collector import ReadCollector
 from ..dataframe_helpers import allele_reads_to_dataframe, read_evidence_generator_to_dataframe
@@ -72,7 +75,7 @@ def add_rna_args(
         help=(
             "Number of threads to use for decompression of BAM/CRAM files "
             "(default %(default)s)."),
-        default=1)
+        default=DECOMPRESSION_THREADS)
 
     return rna_group
 
@@ -134,4 +134,10 @@ MIN_RATIO_RNA_ALT_TO_OTHER_FRAGMENTS = 3.0
 
 # number of RNA fragments shared between two assembled protein sequences
 # before we say that their variants are phased
-MIN_SHARED_FRAGMENTS_FOR_PHASING = 2
\ No newline at end of file
+MIN_SHARED_FRAGMENTS_FOR_PHASING = 2
+
+# number of threads used by htslib to decompress BAM/CRAM files, kept at a
+# single thread by default; raising it (e.g. with
+# --num-rna-decompression-threads) can speed up fetching reads when BGZF
+# decompression is the bottleneck
+DECOMPRESSION_THREADS = 1
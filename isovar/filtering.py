@@ -21,6 +21,52 @@ from __future__ import print_function, division, absolute_import
 from collections import OrderedDict
 import operator
 
+from six.moves import intern
+
+# sentinel used to detect missing IsovarResult properties with a single
+# getattr call, since None is a valid value for many properties
+_MISSING = object()
+
+# memoized results of parse_threshold_filter_name, since the same small
+# set of filter names gets evaluated for every variant
+_THRESHOLD_FILTER_NAME_CACHE = {}
+
+
+def parse_threshold_filter_name(name):
+    """
+    Split a threshold filter name such as "min_num_alt_reads" into the
+    name of the IsovarResult field it refers to and the comparison
+    used against the cutoff value.
+
+    Parameters
+    ----------
+    name : str
+        Filter name starting with either "min_" or "max_"
+
+    Returns
+    -------
+    Tuple of (str, function)
+    """
+    if name in _THRESHOLD_FILTER_NAME_CACHE:
+        return _THRESHOLD_FILTER_NAME_CACHE[name]
+    parts = name.split("_")
+    min_or_max = parts[0]
+    field_name = "_".join(parts[1:])
+    if isinstance(field_name, str):
+        # intern field name so getattr can match it against attribute names
+        # by identity, only for str since intern rejects unicode on Python 2
+        field_name = intern(field_name)
+    if min_or_max == "min":
+        comparison_fn = operator.ge
+    elif min_or_max == "max":
+        comparison_fn = operator.le
+    else:
+        raise ValueError(
+            "Invalid filter '%s', must start with 'min' or 'max'" % name)
+    result = (field_name, comparison_fn)
+    _THRESHOLD_FILTER_NAME_CACHE[name] = result
+    return result
+
 
 def evaluate_threshold_filters(isovar_result, filter_thresholds):
     """
@@ -44,19 +90,9 @@ def evaluate_threshold_filters(isovar_result, filter_thresholds):
     """
     filter_values_dict = OrderedDict()
     for name, threshold in filter_thresholds.items():
-        parts = name.split("_")
-        min_or_max = parts[0]
-        field_name = "_".join(parts[1:])
-        if min_or_max == "min":
-            comparison_fn = operator.ge
-        elif min_or_max == "max":
-            comparison_fn = operator.le
-        else:
-            raise ValueError(
-                "Invalid filter '%s', must start with 'min' or 'max'" % name)
-        if hasattr(isovar_result, field_name):
-            field_value = getattr(isovar_result, field_name)
-        else:
+        field_name, comparison_fn = parse_threshold_filter_name(name)
+        field_value = getattr(isovar_result, field_name, _MISSING)
+        if field_value is _MISSING:
             raise ValueError(
                 "Invalid filter '%s' IsovarResult does not have property '%s'" % (
                     name,
@@ -87,9 +123,8 @@ def evaluate_boolean_filters(isovar_result, filter_flags):
         else:
             boolean_field_name = boolean_filter_name
             negate = False
-        if hasattr(isovar_result, boolean_field_name):
-            field_value = getattr(isovar_result, boolean_field_name)
-        else:
+        field_value = getattr(isovar_result, boolean_field_name, _MISSING)
+        if field_value is _MISSING:
             raise ValueError(
                 "IsovarResult does not have field name '%s'" % boolean_field_name)
         if field_value is None:
@@ -172,10 +207,10 @@ def apply_filters(
 
     Returns IsovarResult
     """
-    filter_values = OrderedDict(isovar_result.filter_values.items())
-    new_filter_values = evaluate_filters(
-        isovar_result,
-        filter_thresholds=filter_thresholds,
-        filter_flags=filter_flags)
-    filter_values.update(new_filter_values)
+    filter_values = OrderedDict(isovar_result.filter_values)
+    filter_values.update(
+        evaluate_filters(
+            isovar_result,
+            filter_thresholds=filter_thresholds,
+            filter_flags=filter_flags))
     return isovar_result.clone_with_updates(filter_values=filter_values)
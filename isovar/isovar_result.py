@@ -21,12 +21,60 @@ and any protein sequences which were successfully translated for it.
 from __future__ import print_function, division, absolute_import
 
 from collections import OrderedDict
+import operator
 
 from cached_property import cached_property
 
 from .common import safediv
 from .alignment_score import alignment_score
 
+# names of fields on varcode effects which get copied into
+# IsovarResult.to_record
+_EFFECT_FIELDS = (
+    "gene_name",
+    "gene_id",
+    "transcript_id",
+    "transcript_name",
+    "modifies_protein_sequence",
+    "original_protein_sequence",
+    "aa_mutation_start_offset",
+    "aa_mutation_end_offset",
+    "mutant_protein_sequence",
+)
+
+_get_effect_fields = operator.attrgetter(*_EFFECT_FIELDS)
+
+# keys used to store effect fields in IsovarResult.to_record
+_EFFECT_RECORD_KEYS = tuple(
+    "predicted_effect_" + field_name
+    for field_name in _EFFECT_FIELDS)
+
+# names used in IsovarResult.to_record paired with names of fields
+# on ProteinSequence
+_PROTEIN_SEQUENCE_RECORD_FIELDS = (
+    ("protein_sequence", "amino_acids"),
+    ("protein_sequence_ends_with_stop_codon", "ends_with_stop_codon"),
+    ("protein_sequence_gene_names", "gene_names"),
+    ("protein_sequence_gene_ids", "gene_ids"),
+    ("protein_sequence_transcript_names", "transcript_names"),
+    ("protein_sequence_transcript_ids", "transcript_ids"),
+)
+
+# maps names of filters to their column names in IsovarResult.to_record,
+# since the same filters are usually applied to every variant
+_FILTER_RECORD_KEYS = {}
+
+
+def _equal_or_both_none(x, y):
+    """
+    Compare two field values without calling __eq__ on mixtures of None and
+    other objects, since varcode objects don't expect to be compared with None.
+    """
+    if x is None or y is None:
+        return x is y
+    return x == y
+
+
 class IsovarResult(object):
     """
     This object represents all information gathered about a variant,
@@ -97,20 +145,23 @@ class IsovarResult(object):
             self.phased_variants_in_protein_sequence = \
                 phased_variants_in_protein_sequence
 
+    # names of fields used to construct an IsovarResult instance
+    _fields = (
+        "variant",
+        "predicted_effect",
+        "read_evidence",
+        "sorted_protein_sequences",
+        "filter_values",
+        "phased_variants_in_supporting_reads",
+        "phased_variants_in_protein_sequence",
+    )
+
     @property
     def fields(self):
         """
         List of field names used to construct an IsovarResult instance.
         """
-        return [
-            "variant",
-            "predicted_effect",
-            "read_evidence",
-            "sorted_protein_sequences",
-            "filter_values",
-            "phased_variants_in_supporting_reads",
-            "phased_variants_in_protein_sequence",
-        ]
+        return list(self._fields)
 
     def __str__(self):
         field_strings = ["%s=%s" % (k, v) for (k, v) in self.to_dict().items()]
@@ -120,16 +171,33 @@ class IsovarResult(object):
         )
 
     def __eq__(self, other):
-        for field_name in self.fields:
-            my_value = getattr(self, field_name)
-            other_value = getattr(other, field_name)
-            if my_value is None and other_value is not None:
-                return False
-            elif other_value is None and my_value is not None:
-                return False
-            elif my_value != other_value:
-                return False
-        return True
+        if self is other:
+            return True
+        if self.__class__ is not other.__class__:
+            return False
+        return (
+            _equal_or_both_none(self.variant, other.variant) and
+            _equal_or_both_none(
+                self.predicted_effect, other.predicted_effect) and
+            _equal_or_both_none(self.read_evidence, other.read_evidence) and
+            _equal_or_both_none(
+                self.sorted_protein_sequences,
+                other.sorted_protein_sequences) and
+            _equal_or_both_none(self.filter_values, other.filter_values) and
+            _equal_or_both_none(
+                self.phased_variants_in_supporting_reads,
+                other.phased_variants_in_supporting_reads) and
+            _equal_or_both_none(
+                self.phased_variants_in_protein_sequence,
+                other.phased_variants_in_protein_sequence))
+
+    def __ne__(self, other):
+        return not (self == other)
+
+    def __hash__(self):
+        # only hash the variant since the remaining fields are mutable
+        # collections, equal IsovarResults always have equal variants
+        return hash(self.variant)
 
     def __repr__(self):
         return str(self)
@@ -142,7 +210,7 @@ class IsovarResult(object):
         """
         return OrderedDict([
             (k, getattr(self, k))
-            for k in self.fields
+            for k in self._fields
         ])
 
     def clone_with_updates(self, **kwargs):
@@ -152,10 +220,22 @@ class IsovarResult(object):
 
         Returns IsovarResult
         """
-        for (k, v) in self.to_dict().items():
+        for k in self._fields:
             if k not in kwargs:
-                kwargs[k] = v
-        return IsovarResult(**kwargs)
+                kwargs[k] = getattr(self, k)
+        result = IsovarResult(**kwargs)
+        if result.read_evidence is self.read_evidence:
+            # read counts, fractions, and ratios only depend on read_evidence
+            # so if it hasn't changed then copy any values already computed
+            # by cached_property instead of recomputing them on the clone
+            for name in _READ_EVIDENCE_CACHED_PROPERTIES:
+                if name in self.__dict__:
+                    result.__dict__[name] = self.__dict__[name]
+        if (result.filter_values is self.filter_values and
+                "passes_all_filters" in self.__dict__):
+            result.__dict__["passes_all_filters"] = \
+                self.__dict__["passes_all_filters"]
+        return result
 
     def clone(self):
         """
@@ -187,14 +267,12 @@ class IsovarResult(object):
         ])
 
         # get all quantitative fields from this object
-        for key in dir(self):
-            if key.startswith("num_") or key.startswith("fraction_") or key.startswith("ratio_"):
-                d[key] = getattr(self, key)
+        for key in _QUANTITATIVE_PROPERTIES:
+            d[key] = getattr(self, key)
 
         # get all boolean properties that start with "has_"
-        for key in dir(self):
-            if key.startswith("has_"):
-                d[key] = getattr(self, key)
+        for key in _BOOLEAN_PROPERTIES:
+            d[key] = getattr(self, key)
 
         ########################################################################
         # predicted protein changes without looking at RNA reads
@@ -206,42 +284,24 @@ class IsovarResult(object):
         d["predicted_effect_modifies_protein_sequence"] = \
             self.predicted_effect_modifies_protein_sequence
 
-        # list of field names on varcode effect properties
-        effect_properties = [
-            "gene_name",
-            "gene_id",
-            "transcript_id",
-            "transcript_name",
-            "modifies_protein_sequence",
-            "original_protein_sequence",
-            "aa_mutation_start_offset",
-            "aa_mutation_end_offset",
-            "mutant_protein_sequence"
-        ]
-        for field_name in effect_properties:
-            # store effect fields with prefix 'predicted_effect_' and use
-            # getattr in case the field is not available for all effects
-            d["predicted_effect_%s" % field_name] = getattr(
-                effect,
-                field_name,
-                None)
+        try:
+            effect_values = _get_effect_fields(effect)
+        except AttributeError:
+            # fall back on getattr with a default since not every field
+            # is available for all effects
+            effect_values = tuple(
+                getattr(effect, field_name, None)
+                for field_name in _EFFECT_FIELDS)
+        for key, value in zip(_EFFECT_RECORD_KEYS, effect_values):
+            # store effect fields with prefix 'predicted_effect_'
+            d[key] = value
 
         ########################################################################
         # get the top protein sequence, if one exists
         ########################################################################
         protein_sequence = self.top_protein_sequence
 
-        # list of names we want to use in the result dictionary,
-        # paired with names of fields on ProteinSequence
-        protein_sequence_properties = [
-            ("protein_sequence", "amino_acids"),
-            ("protein_sequence_ends_with_stop_codon", "ends_with_stop_codon"),
-            ("protein_sequence_gene_names", "gene_names"),
-            ("protein_sequence_gene_ids", "gene_ids"),
-            ("protein_sequence_transcript_names", "transcript_names"),
-            ("protein_sequence_transcript_ids", "transcript_ids"),
-        ]
-        for (name, protein_sequence_field) in protein_sequence_properties:
+        for (name, protein_sequence_field) in _PROTEIN_SEQUENCE_RECORD_FIELDS:
             value = getattr(protein_sequence, protein_sequence_field, None)
             if isinstance(value, (list, set, tuple)):
                 value = ";".join(value)
@@ -264,7 +324,11 @@ class IsovarResult(object):
         # filters
         ########################################################################
         for filter_name, filter_value in self.filter_values.items():
-            d["filter:%s" % filter_name] = filter_value
+            key = _FILTER_RECORD_KEYS.get(filter_name)
+            if key is None:
+                key = "filter:%s" % filter_name
+                _FILTER_RECORD_KEYS[filter_name] = key
+            d[key] = filter_value
         d["passes_all_filters"] = self.passes_all_filters
         return d
 
@@ -275,10 +339,7 @@ class IsovarResult(object):
         Does this IsovarResult have True for all the filter values in
         self.filter_values?
         """
-        if len(self.filter_values) == 0:
-            return True
-        else:
-            return all(list(self.filter_values.values()))
+        return all(self.filter_values.values())
 
     @cached_property
     def top_protein_sequence(self):
@@ -714,7 +775,7 @@ class IsovarResult(object):
         """
         transcripts = self.transcripts_from_protein_sequences(
             max_num_protein_sequences=max_num_protein_sequences)
-        genes = [t.gene for t in transcripts]
+        genes = {t.gene for t in transcripts}
         return sorted(genes)
 
     def gene_ids_from_protein_sequences(self, max_num_protein_sequences=None):
@@ -730,11 +791,13 @@ class IsovarResult(object):
 
         Returns list of str
         """
+        # use the gene ID stored on each transcript instead of constructing
+        # a pyensembl.Gene object for each one
         return sorted({
-            g.id
-            for g
+            t.gene_id
+            for t
             in
-            self.genes_from_protein_sequences(
+            self.transcripts_from_protein_sequences(
                 max_num_protein_sequences=max_num_protein_sequences)
         })
 
@@ -772,11 +835,14 @@ class IsovarResult(object):
 
         Returns set of pyensembl.Transcript objects
         """
-        return {
-            t
-            for t in self.variant.transcripts
-            if not only_coding or t.is_protein_coding
-        }
+        if only_coding:
+            return {
+                t
+                for t in self.variant.transcripts
+                if t.is_protein_coding
+            }
+        else:
+            return set(self.variant.transcripts)
 
     def overlapping_transcript_ids(self, only_coding=True):
         """
@@ -789,11 +855,14 @@ class IsovarResult(object):
             protein (default=True)
         Returns set of str
         """
-        return {
-            t.id
-            for t in self.variant.transcripts
-            if not only_coding or t.is_protein_coding
-        }
+        if only_coding:
+            return {
+                t.id
+                for t in self.variant.transcripts
+                if t.is_protein_coding
+            }
+        else:
+            return set(self.variant.transcript_ids)
 
     @cached_property
     def num_overlapping_transcripts(self):
@@ -825,11 +894,14 @@ class IsovarResult(object):
 
         Returns list of pyensembl.Gene objects
         """
-        return sorted({
-            g
-            for g in self.variant.genes
-            if not only_coding or g.is_protein_coding
-        })
+        if only_coding:
+            return sorted({
+                g
+                for g in self.variant.genes
+                if g.is_protein_coding
+            })
+        else:
+            return sorted(set(self.variant.genes))
 
     def overlapping_gene_names(self, only_coding=True):
         """
@@ -859,11 +931,16 @@ class IsovarResult(object):
 
         Returns set of str
         """
-        return {
-            g.id
-            for g in self.variant.genes
-            if not only_coding or g.is_protein_coding
-        }
+        if only_coding:
+            return {
+                g.id
+                for g in self.variant.genes
+                if g.is_protein_coding
+            }
+        else:
+            # use the genes already loaded by variant.genes rather than
+            # variant.gene_ids, which runs a separate database query
+            return {g.id for g in self.variant.genes}
 
     @cached_property
     def num_overlapping_genes(self):
@@ -910,14 +987,14 @@ class IsovarResult(object):
         """
         Names of reference reads at this locus.
         """
-        return {r.name for r in self.ref_reads}
+        return frozenset(r.name for r in self.ref_reads)
 
     @cached_property
     def alt_read_names(self):
         """
         Names of alt reads at this locus.
         """
-        return {r.name for r in self.alt_reads}
+        return frozenset(r.name for r in self.alt_reads)
 
     @cached_property
     def ref_and_alt_read_names(self):
@@ -931,14 +1008,16 @@ class IsovarResult(object):
         """
         Names of other (non-alt, non-ref) reads at this locus.
         """
-        return {r.name for r in self.other_reads}
+        return frozenset(r.name for r in self.other_reads)
 
     @cached_property
     def all_read_names(self):
         """
         Names of all reads at this locus.
         """
-        return self.ref_read_names.union(self.alt_read_names).union(self.other_read_names)
+        return self.ref_read_names.union(
+            self.alt_read_names,
+            self.other_read_names)
 
     @cached_property
     def num_total_reads(self):
@@ -1124,4 +1203,55 @@ class IsovarResult(object):
 
         Returns int
         """
-        return len(self.phased_variants_in_protein_sequence)
\ No newline at end of file
+        return len(self.phased_variants_in_protein_sequence)
+
+
+# names of cached properties on IsovarResult which are computed only from
+# its read_evidence field and can be shared between clones
+_READ_EVIDENCE_CACHED_PROPERTIES = (
+    "ref_reads",
+    "alt_reads",
+    "other_reads",
+    "ref_read_names",
+    "alt_read_names",
+    "other_read_names",
+    "ref_and_alt_read_names",
+    "all_read_names",
+    "num_total_reads",
+    "num_total_fragments",
+    "num_ref_reads",
+    "num_ref_fragments",
+    "num_alt_reads",
+    "num_alt_fragments",
+    "num_other_reads",
+    "num_other_fragments",
+    "fraction_ref_reads",
+    "fraction_ref_fragments",
+    "fraction_alt_reads",
+    "fraction_alt_fragments",
+    "fraction_other_reads",
+    "fraction_other_fragments",
+    "ratio_other_to_ref_reads",
+    "ratio_other_to_ref_fragments",
+    "ratio_other_to_alt_reads",
+    "ratio_other_to_alt_fragments",
+    "ratio_ref_to_other_reads",
+    "ratio_ref_to_other_fragments",
+    "ratio_alt_to_other_reads",
+    "ratio_alt_to_other_fragments",
+)
+
+# names of quantitative properties included in IsovarResult.to_record,
+# collected once here instead of scanning dir(self) for every record
+_QUANTITATIVE_PROPERTIES = tuple(
+    name
+    for name in dir(IsovarResult)
+    if name.startswith(("num_", "fraction_", "ratio_"))
+)
+
+# names of boolean properties included in IsovarResult.to_record
+_BOOLEAN_PROPERTIES = tuple(
+    name
+    for name in dir(IsovarResult)
+    if name.startswith("has_")
+)
@@ -38,7 +38,8 @@ from .default_parameters import (
     MAX_FRACTION_RNA_OTHER_READS,
     MAX_FRACTION_RNA_OTHER_FRAGMENTS,
     MIN_RATIO_RNA_ALT_TO_OTHER_FRAGMENTS,
-    MIN_SHARED_FRAGMENTS_FOR_PHASING
+    MIN_SHARED_FRAGMENTS_FOR_PHASING,
+    DECOMPRESSION_THREADS,
 )
 from .effect_prediction import top_varcode_effect
 from .filtering import apply_filters
@@ -85,7 +86,7 @@ def run_isovar(
         filter_thresholds=DEFAULT_FILTER_THRESHOLDS,
         filter_flags=DEFAULT_FILTER_FLAGS,
         min_shared_fragments_for_phasing=MIN_SHARED_FRAGMENTS_FOR_PHASING,
-        decompression_threads=1):
+        decompression_threads=DECOMPRESSION_THREADS):
     """
     This is the main entrypoint into the Isovar library, which collects
     RNA reads supporting variants and translates their coding sequence
@@ -127,9 +128,9 @@ def run_isovar(
         they can also be negated by prepending "not_",
         such as "not_has_protein_sequence".
 
-    decompress_threads : int
+    decompression_threads : int
         Number of threads used by htslib to decompress BAM/CRAM
-        files.
+        files, only used when alignment_file is a path.
 
     Generator of IsovarResult objects, one for each variant. The
     `protein_sequences` field of the IsovarVar result will be empty
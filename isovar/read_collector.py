@@ -30,6 +30,11 @@ from .read_evidence import ReadEvidence
 
 logger = get_logger(__name__)
 
+# bits of the SAM FLAG field, as defined in the SAM specification
+BAM_FUNMAP = 0x4
+BAM_FSECONDARY = 0x100
+BAM_FDUP = 0x400
+
 
 class ReadCollector(object):
     """
@@ -94,13 +99,13 @@ class ReadCollector(object):
         name = pysam_aligned_segment.query_name
 
         if name is None:
-            logger.warn(
+            logger.warning(
                 "Read missing name at position %d",
                 base0_start_inclusive + 1)
             return None
 
         if pysam_aligned_segment.is_unmapped:
-            logger.warn(
+            logger.warning(
                 "How did we get unmapped read '%s' in a pileup?", name)
             return None
 
@@ -108,7 +113,7 @@ class ReadCollector(object):
         mapping_quality = pysam_aligned_segment.mapping_quality
 
         if self.min_mapping_quality > 0 and (mapping_quality is None):
-            logger.debug("Skipping read '%s' due to missing MAPQ" % name)
+            logger.debug("Skipping read '%s' due to missing MAPQ", name)
             return None
         elif mapping_quality < self.min_mapping_quality:
             logger.debug(
@@ -118,23 +123,51 @@ class ReadCollector(object):
                 self.min_mapping_quality)
             return None
 
-        sequence = pysam_aligned_segment.query_sequence
+        reference_interval_size = base0_end_exclusive - base0_start_inclusive
+        if reference_interval_size < 0:
+            raise ValueError("Unexpected interval start after interval end")
 
-        if sequence is None:
-            logger.warn("Skipping read '%s' due to missing sequence" % name)
+        # Before building any per-base lists, skip reads whose aligned span
+        # can't contain the reference positions we need to look up below.
+        # Insertions need the bases on both sides of the insertion point
+        # to be mapped, otherwise we need the first reference base
+        # (or the one before it) and the last reference base.
+        if reference_interval_size == 0:
+            min_reference_start = base0_start_inclusive - 1
+            min_reference_end = base0_end_exclusive + 1
+        else:
+            min_reference_start = base0_start_inclusive
+            min_reference_end = base0_end_exclusive
+        reference_end = pysam_aligned_segment.reference_end
+        if (reference_end is None or
+                reference_end < min_reference_end or
+                pysam_aligned_segment.reference_start > min_reference_start):
             return None
 
-        base_qualities = pysam_aligned_segment.query_qualities
+        if self.use_soft_clipped_bases:
+            sequence = pysam_aligned_segment.query_sequence
+            base_qualities = pysam_aligned_segment.query_qualities
+        else:
+            # if we're not allowing soft clipped bases then only the
+            # aligned portion of the read is usable, so let pysam decode
+            # just that part instead of decoding the whole read and then
+            # slicing off the soft-clipped ends
+            sequence = pysam_aligned_segment.query_alignment_sequence
+            base_qualities = pysam_aligned_segment.query_alignment_qualities
+
+        if sequence is None:
+            logger.warning("Skipping read '%s' due to missing sequence", name)
+            return None
 
         if base_qualities is None:
-            logger.warn("Skipping read '%s' due to missing base qualities" % name)
+            logger.warning("Skipping read '%s' due to missing base qualities", name)
             return None
         elif len(base_qualities) != len(sequence):
-            logger.warn(
-                "Skipping read '%s' due to mismatch in length of sequence (%d) and qualities (%d)" % (
-                    name,
-                    len(sequence),
-                    len(base_qualities)))
+            logger.warning(
+                "Skipping read '%s' due to mismatch in length of sequence (%d) and qualities (%d)",
+                name,
+                len(sequence),
+                len(base_qualities))
             return None
 
         # By default, AlignedSegment.get_reference_positions only returns base-1 positions
@@ -145,17 +178,37 @@ class ReadCollector(object):
         base0_reference_positions = \
             pysam_aligned_segment.get_reference_positions(full_length=True)
 
+        if not self.use_soft_clipped_bases:
+            # Trim soft-clipped ends off the positions to match the aligned
+            # sequence and qualities. Soft-clipped bases have no reference
+            # position, so read indices found below are already relative
+            # to the start of the aligned sequence.
+            aligned_subsequence_start = pysam_aligned_segment.query_alignment_start
+            aligned_subsequence_end = pysam_aligned_segment.query_alignment_end
+            # most reads have no soft-clipped bases, in which case slicing
+            # would only copy the positions
+            if (aligned_subsequence_start > 0 or
+                    aligned_subsequence_end < len(base0_reference_positions)):
+                base0_reference_positions = base0_reference_positions[
+                    aligned_subsequence_start:aligned_subsequence_end]
+
         if len(base0_reference_positions) != len(base_qualities):
-            logger.warn(
-                "Skipping read '%s' due to mismatch in length of positions (%d) and qualities (%d)" % (
-                    name,
-                    len(base0_reference_positions),
-                    len(base_qualities)))
+            logger.warning(
+                "Skipping read '%s' due to mismatch in length of positions (%d) and qualities (%d)",
+                name,
+                len(base0_reference_positions),
+                len(base_qualities))
             return None
 
-        reference_interval_size = base0_end_exclusive - base0_start_inclusive
-        if reference_interval_size < 0:
-            raise ValueError("Unexpected interval start after interval end")
+        # map each reference position to the index of the read base aligned
+        # to it, so that each lookup below is a single dictionary access
+        # instead of a linear scan through base0_reference_positions
+        reference_position_to_read_index = {
+            reference_position: read_index
+            for (read_index, reference_position)
+            in enumerate(base0_reference_positions)
+            if reference_position is not None
+        }
 
         # TODO:
         #  Consider how to handle variants before splice sites, where
@@ -192,17 +245,16 @@ class ReadCollector(object):
             # going to allow the start/end to be None.
             reference_position_before_insertion = base0_start_inclusive - 1
             reference_position_after_insertion = base0_start_inclusive
-            if reference_position_before_insertion in base0_reference_positions:
-                read_base0_before_insertion = \
-                    base0_reference_positions.index(
-                        reference_position_before_insertion)
-            else:
+            read_base0_before_insertion = \
+                reference_position_to_read_index.get(
+                    reference_position_before_insertion)
+            if read_base0_before_insertion is None:
                 return None
 
-            if reference_position_after_insertion in base0_reference_positions:
-                read_base0_after_insertion = base0_reference_positions.index(
+            read_base0_after_insertion = \
+                reference_position_to_read_index.get(
                     reference_position_after_insertion)
-            else:
+            if read_base0_after_insertion is None:
                 return None
 
             if read_base0_after_insertion - read_base0_after_insertion == 1:
@@ -231,49 +283,32 @@ class ReadCollector(object):
             # figure out which read indices correspond to base0_start_inclusive and
             # base0_end_exclusive but this would fail if base0_end_exclusive is
             # after the end the end of the read.
-            if base0_start_inclusive in base0_reference_positions:
-                read_base0_start_inclusive = base0_reference_positions.index(base0_start_inclusive)
-            elif base0_start_inclusive - 1 in base0_reference_positions:
+            read_base0_start_inclusive = \
+                reference_position_to_read_index.get(base0_start_inclusive)
+            if read_base0_start_inclusive is None:
                 # if first base of reference locus isn't mapped, try getting the base
                 # before it and then adding one to its corresponding base index
                 read_base0_position_before_locus = \
-                    base0_reference_positions.index(base0_start_inclusive - 1)
+                    reference_position_to_read_index.get(base0_start_inclusive - 1)
+                if read_base0_position_before_locus is None:
+                    return None
                 read_base0_start_inclusive = read_base0_position_before_locus + 1
-            else:
-                return None
 
-            if base0_end_exclusive in base0_reference_positions:
-                read_base0_end_exclusive = \
-                    base0_reference_positions.index(base0_end_exclusive)
-            elif (base0_end_exclusive - 1) in base0_reference_positions:
+            read_base0_end_exclusive = \
+                reference_position_to_read_index.get(base0_end_exclusive)
+            if read_base0_end_exclusive is None:
                 # if exclusive last index of reference interval doesn't have a corresponding
                 # base position then try getting the base position of the reference
                 # position before it and then adding one
                 read_base0_end_inclusive = \
-                    base0_reference_positions.index(base0_end_exclusive - 1)
+                    reference_position_to_read_index.get(base0_end_exclusive - 1)
+                if read_base0_end_inclusive is None:
+                    return None
                 read_base0_end_exclusive = read_base0_end_inclusive + 1
-            else:
-                return None
 
         if isinstance(sequence, bytes):
             sequence = sequence.decode('ascii')
 
-        if not self.use_soft_clipped_bases:
-            # if we're not allowing soft clipped based then
-            # the fraction of the read which is usable may be smaller
-            # than the sequence, qualities, and alignment positions
-            # we've extracted, so slice through those to get rid of
-            # soft-clipped ends of the read
-            aligned_subsequence_start = pysam_aligned_segment.query_alignment_start
-            aligned_subsequence_end = pysam_aligned_segment.query_alignment_end
-            sequence = sequence[aligned_subsequence_start:aligned_subsequence_end]
-            base0_reference_positions = base0_reference_positions[
-                aligned_subsequence_start:aligned_subsequence_end]
-            base_qualities = base_qualities[aligned_subsequence_start:aligned_subsequence_end]
-            if read_base0_start_inclusive is not None:
-                read_base0_start_inclusive -= aligned_subsequence_start
-            if read_base0_end_exclusive is not None:
-                read_base0_end_exclusive -= aligned_subsequence_start
         return LocusRead(
             name=name,
             sequence=sequence,
@@ -321,11 +356,25 @@ class ReadCollector(object):
         # any reads
         base0_pos_before_start = base0_start_inclusive - 1
         base0_pos_after_end = base0_end_exclusive + 1
+        # Reads which are unmapped, secondary, or duplicates (when those
+        # aren't allowed) can be dropped by testing a single mask against
+        # their FLAG field instead of decoding each property separately
+        excluded_flags = BAM_FUNMAP
+        if not self.use_secondary_alignments:
+            excluded_flags |= BAM_FSECONDARY
+        if not self.use_duplicate_reads:
+            excluded_flags |= BAM_FDUP
+        # bind the per-read method and list append once for the whole
+        # locus rather than looking them up again for each read
+        create_locus_read = self.locus_read_from_pysam_aligned_segment
+        add_read = reads.append
         for aligned_segment in alignment_file.fetch(
                 chromosome,
                 base0_start_inclusive,
                 base0_end_exclusive):
             total_count += 1
+            if aligned_segment.flag & excluded_flags:
+                continue
             # we get a significant speed up if we skip reads that have spliced
             # out the entire interval of interest. this is redundant with the
             # attempt to find mapping positions in
@@ -334,12 +383,14 @@ class ReadCollector(object):
             # where ~1M reads are mapped
             if aligned_segment.get_overlap(base0_pos_before_start, base0_pos_after_end) == 0:
                 continue
-            read = self.locus_read_from_pysam_aligned_segment(
+            # pass the locus positionally since this call is made for every
+            # read and keyword arguments are slower to bind
+            read = create_locus_read(
                 aligned_segment,
-                base0_start_inclusive=base0_start_inclusive,
-                base0_end_exclusive=base0_end_exclusive)
+                base0_start_inclusive,
+                base0_end_exclusive)
             if read is not None:
-                reads.append(read)
+                add_read(read)
         logger.info(
             "Kept %d/%d reads overlapping locus %s:%d-%d",
             len(reads),
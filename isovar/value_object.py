@@ -88,7 +88,10 @@ class ValueObject(object):
         return hash(self._values)
 
     def __eq__(self, other):
-        return self.__class__ is other.__class__ and all(
-            value_self == value_other
-            for (value_self, value_other) in
-            zip(self._values_generator(), other._values_generator()))
+        # comparing tuples of field values happens in C, which is much
+        # faster than comparing fields one at a time from Python
+        return self.__class__ is other.__class__ and (
+            self._values == other._values)
+
+    def __ne__(self, other):
+        return not (self == other)
@@ -59,6 +59,41 @@ class MockVariantSequence(object):
 class MockReferenceContext(object):
     pass
 
+class MockGene(object):
+    def __init__(self, gene_id):
+        self.id = gene_id
+
+    def __eq__(self, other):
+        return self.__class__ is other.__class__ and self.id == other.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __lt__(self, other):
+        return self.id < other.id
+
+class MockTranscript(object):
+    """
+    Transcript which only constructs its gene object when asked for it,
+    counting how many times that happens.
+    """
+    def __init__(self, transcript_id, gene_id):
+        self.id = transcript_id
+        self.gene_id = gene_id
+        self.num_gene_lookups = 0
+
+    @property
+    def gene(self):
+        self.num_gene_lookups += 1
+        return MockGene(self.gene_id)
+
+    def __lt__(self, other):
+        return self.id < other.id
+
+class MockProteinSequence(object):
+    def __init__(self, transcripts):
+        self.transcripts = transcripts
+
 def make_dummy_translation(
         amino_acids="MKHW",  # ATG=M|AAA=K|CAC=H|TGG=W
         cdna_sequence="CCCATGAAACACTGGTAG",
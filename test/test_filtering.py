@@ -1,4 +1,8 @@
-from isovar.filtering import apply_filters
+import operator
+
+from nose.tools import eq_, assert_raises
+
+from isovar.filtering import apply_filters, parse_threshold_filter_name
 
 class MockIsovarResult(object):
     """
@@ -53,4 +57,27 @@ def test_apply_filters_negated_bool_pass():
 def test_apply_filters_negated_bool_fail():
     obj = MockIsovarResult(x=True)
     new_obj = apply_filters(obj, filter_flags=["not_x"])
-    assert not new_obj.filter_values["not_x"]
\ No newline at end of file
+    assert not new_obj.filter_values["not_x"]
+
+def test_parse_threshold_filter_name():
+    eq_(parse_threshold_filter_name("min_num_alt_reads"),
+        ("num_alt_reads", operator.ge))
+    eq_(parse_threshold_filter_name("max_num_alt_reads"),
+        ("num_alt_reads", operator.le))
+
+def test_parse_threshold_filter_name_unicode():
+    eq_(parse_threshold_filter_name(u"min_num_alt_reads"),
+        (u"num_alt_reads", operator.ge))
+
+def test_apply_filters_unicode_names():
+    obj = MockIsovarResult(x=1, y=False)
+    new_obj = apply_filters(
+        obj,
+        filter_thresholds={u"min_x": 1},
+        filter_flags=[u"not_y"])
+    assert new_obj.filter_values[u"min_x"]
+    assert new_obj.filter_values[u"not_y"]
+
+def test_parse_threshold_filter_name_invalid():
+    with assert_raises(ValueError):
+        parse_threshold_filter_name("num_alt_reads")
@@ -1,7 +1,10 @@
 from isovar import run_isovar
 from isovar import ProteinSequence
+from isovar import ReadEvidence
+from isovar import IsovarResult
 from varcode import Variant
 from testing_helpers import data_path
+from mock_objects import MockTranscript, MockProteinSequence
 
 from nose.tools import eq_
 
@@ -87,6 +90,29 @@ def test_isovar_result_clone():
         result2 = result.clone()
         eq_(result, result2)
 
+def test_isovar_result_hash():
+    results = list(run_isovar(
+        variants=data_path("data/b16.f10/b16.vcf"),
+        alignment_file=data_path("data/b16.f10/b16.combined.sorted.bam")))
+    clones = [result.clone() for result in results]
+    for result, result2 in zip(results, clones):
+        eq_(hash(result), hash(result2))
+        assert result2 in set(results)
+        eq_({result: "value"}[result2], "value")
+    eq_(len(set(results + clones)), len(set(results)))
+
+
+def test_isovar_result_eq_other_type():
+    for result in run_isovar(
+            variants=data_path("data/b16.f10/b16.vcf"),
+            alignment_file=data_path("data/b16.f10/b16.combined.sorted.bam")):
+        eq_(result == object(), False)
+        eq_(result == "IsovarResult", False)
+        eq_(result == None, False)
+        eq_(result != object(), True)
+        eq_(result != "IsovarResult", True)
+
+
 def test_isovar_result_clone_with_updates():
     for result in run_isovar(
             variants=data_path("data/b16.f10/b16.vcf"),
@@ -95,6 +121,15 @@ def test_isovar_result_clone_with_updates():
         assert result != result2
 
 
+def test_isovar_result_to_record_unicode_filter_name():
+    for result in run_isovar(
+            variants=data_path("data/b16.f10/b16.vcf"),
+            alignment_file=data_path("data/b16.f10/b16.combined.sorted.bam")):
+        result2 = result.clone_with_updates(
+            filter_values={u"not_has_protein_sequence": True})
+        eq_(result2.to_record()[u"filter:not_has_protein_sequence"], True)
+
+
 def test_isovar_result_str():
     for result in run_isovar(
             variants=data_path("data/b16.f10/b16.vcf"),
@@ -102,4 +137,74 @@ def test_isovar_result_str():
         s = str(result)
         assert len(s) > 0
         assert s.startswith("IsovarResult(")
-        assert s.endswith(")")
\ No newline at end of file
+        assert s.endswith(")")
+
+def test_isovar_result_clone_keeps_read_counts():
+    for result in run_isovar(
+            variants=data_path("data/b16.f10/b16.vcf"),
+            alignment_file=data_path("data/b16.f10/b16.combined.sorted.bam")):
+        num_alt_fragments = result.num_alt_fragments
+        alt_read_names = result.alt_read_names
+        result2 = result.clone_with_updates(filter_values={})
+        # cached values should be carried over without being recomputed
+        assert "num_alt_fragments" in result2.__dict__
+        assert "alt_read_names" in result2.__dict__
+        assert result2.alt_read_names is alt_read_names
+        eq_(result2.num_alt_fragments, num_alt_fragments)
+        eq_(result2.num_alt_reads, len(result2.read_evidence.alt_reads))
+
+
+def test_isovar_result_clone_with_new_read_evidence_drops_read_counts():
+    for result in run_isovar(
+            variants=data_path("data/b16.f10/b16.vcf"),
+            alignment_file=data_path("data/b16.f10/b16.combined.sorted.bam")):
+        result.num_alt_fragments
+        result.alt_read_names
+        read_evidence_kwargs = {
+            k: getattr(result.read_evidence, k)
+            for k in result.read_evidence._fields
+        }
+        read_evidence_kwargs["alt_reads"] = []
+        result2 = result.clone_with_updates(
+            read_evidence=ReadEvidence(**read_evidence_kwargs))
+        assert "num_alt_fragments" not in result2.__dict__
+        assert "alt_read_names" not in result2.__dict__
+        eq_(result2.num_alt_fragments, 0)
+        eq_(result2.alt_read_names, frozenset())
+
+
+def make_result_with_mock_transcripts():
+    transcripts = [
+        MockTranscript("T1", gene_id="G1"),
+        MockTranscript("T2", gene_id="G1"),
+        MockTranscript("T3", gene_id="G2"),
+    ]
+    protein_sequences = [
+        MockProteinSequence(transcripts[:2]),
+        MockProteinSequence(transcripts[1:]),
+    ]
+    result = IsovarResult(
+        variant=None,
+        read_evidence=None,
+        predicted_effect=None,
+        sorted_protein_sequences=protein_sequences)
+    return result, transcripts
+
+
+def test_isovar_result_genes_from_protein_sequences_are_distinct():
+    result, _ = make_result_with_mock_transcripts()
+    # two transcripts of G1 should only contribute one gene
+    eq_([g.id for g in result.genes_from_protein_sequences()], ["G1", "G2"])
+    eq_(
+        [g.id for g in result.genes_from_protein_sequences(
+            max_num_protein_sequences=1)],
+        ["G1"])
+
+
+def test_isovar_result_gene_ids_from_protein_sequences_use_transcript_gene_id():
+    result, transcripts = make_result_with_mock_transcripts()
+    eq_(result.gene_ids_from_protein_sequences(), ["G1", "G2"])
+    eq_(result.gene_ids_from_protein_sequences(
+        max_num_protein_sequences=1), ["G1"])
+    # gene IDs should come from Transcript.gene_id without building genes
+    eq_([t.num_gene_lookups for t in transcripts], [0, 0, 0])
@@ -1,5 +1,7 @@
 from __future__ import print_function, division, absolute_import
 
+from array import array
+
 from nose.tools import eq_
 from varcode import Variant
 from isovar.locus_read import LocusRead
@@ -197,6 +199,383 @@ def test_locus_reads_substitution_shorter():
     assert_equal_fields(read, expected)
 
 
+def make_soft_clipped_pysam_read(seq, cigar, reference_start=10):
+    """
+    Create a pysam read with a distinct base quality at every position, so
+    that trimming the wrong bases off the qualities gets caught.
+    """
+    pysam_read = make_pysam_read(
+        seq=seq,
+        cigar=cigar,
+        reference_start=reference_start)
+    pysam_read.query_qualities = array("B", range(20, 20 + len(seq)))
+    return pysam_read
+
+
+def get_single_locus_read(
+        pysam_read,
+        base0_start_inclusive,
+        base0_end_exclusive,
+        use_soft_clipped_bases):
+    samfile = MockAlignmentFile(
+        references=("chromosome",),
+        reads=[pysam_read])
+    read_creator = ReadCollector(use_soft_clipped_bases=use_soft_clipped_bases)
+    reads = read_creator.get_locus_reads(
+        samfile,
+        "chromosome",
+        base0_start_inclusive,
+        base0_end_exclusive)
+    assert len(reads) == 1, \
+        "Expected to get back one read but instead got %d" % (
+            len(reads),)
+    return reads[0]
+
+
+def test_locus_reads_snv_leading_soft_clip():
+    # first two bases are soft-clipped, the rest align to reference
+    # positions 10-13 and the SNV locus is position 12
+    pysam_read = make_soft_clipped_pysam_read(seq="TTACGT", cigar="2S4M")
+
+    read = get_single_locus_read(
+        pysam_read, 12, 13, use_soft_clipped_bases=False)
+    expected = LocusRead(
+        name=pysam_read.qname,
+        sequence="ACGT",
+        reference_positions=[10, 11, 12, 13],
+        quality_scores=array("B", [22, 23, 24, 25]),
+        reference_base0_start_inclusive=12,
+        reference_base0_end_exclusive=13,
+        read_base0_start_inclusive=2,
+        read_base0_end_exclusive=3)
+    assert_equal_fields(read, expected)
+
+    read = get_single_locus_read(
+        pysam_read, 12, 13, use_soft_clipped_bases=True)
+    expected = LocusRead(
+        name=pysam_read.qname,
+        sequence="TTACGT",
+        reference_positions=[None, None, 10, 11, 12, 13],
+        quality_scores=array("B", [20, 21, 22, 23, 24, 25]),
+        reference_base0_start_inclusive=12,
+        reference_base0_end_exclusive=13,
+        read_base0_start_inclusive=4,
+        read_base0_end_exclusive=5)
+    assert_equal_fields(read, expected)
+
+
+def test_locus_reads_snv_trailing_soft_clip():
+    # last two bases are soft-clipped, the rest align to reference
+    # positions 10-13 and the SNV locus is position 11
+    pysam_read = make_soft_clipped_pysam_read(seq="ACGTTT", cigar="4M2S")
+
+    read = get_single_locus_read(
+        pysam_read, 11, 12, use_soft_clipped_bases=False)
+    expected = LocusRead(
+        name=pysam_read.qname,
+        sequence="ACGT",
+        reference_positions=[10, 11, 12, 13],
+        quality_scores=array("B", [20, 21, 22, 23]),
+        reference_base0_start_inclusive=11,
+        reference_base0_end_exclusive=12,
+        read_base0_start_inclusive=1,
+        read_base0_end_exclusive=2)
+    assert_equal_fields(read, expected)
+
+    read = get_single_locus_read(
+        pysam_read, 11, 12, use_soft_clipped_bases=True)
+    expected = LocusRead(
+        name=pysam_read.qname,
+        sequence="ACGTTT",
+        reference_positions=[10, 11, 12, 13, None, None],
+        quality_scores=array("B", [20, 21, 22, 23, 24, 25]),
+        reference_base0_start_inclusive=11,
+        reference_base0_end_exclusive=12,
+        read_base0_start_inclusive=1,
+        read_base0_end_exclusive=2)
+    assert_equal_fields(read, expected)
+
+
+def test_locus_reads_deletion_leading_soft_clip():
+    # reference position 12 is deleted from the read after two
+    # soft-clipped bases
+    pysam_read = make_soft_clipped_pysam_read(seq="TTACGT", cigar="2S2M1D2M")
+
+    read = get_single_locus_read(
+        pysam_read, 12, 13, use_soft_clipped_bases=False)
+    expected = LocusRead(
+        name=pysam_read.qname,
+        sequence="ACGT",
+        reference_positions=[10, 11, 13, 14],
+        quality_scores=array("B", [22, 23, 24, 25]),
+        reference_base0_start_inclusive=12,
+        reference_base0_end_exclusive=13,
+        read_base0_start_inclusive=2,
+        read_base0_end_exclusive=2)
+    assert_equal_fields(read, expected)
+
+    read = get_single_locus_read(
+        pysam_read, 12, 13, use_soft_clipped_bases=True)
+    expected = LocusRead(
+        name=pysam_read.qname,
+        sequence="TTACGT",
+        reference_positions=[None, None, 10, 11, 13, 14],
+        quality_scores=array("B", [20, 21, 22, 23, 24, 25]),
+        reference_base0_start_inclusive=12,
+        reference_base0_end_exclusive=13,
+        read_base0_start_inclusive=4,
+        read_base0_end_exclusive=4)
+    assert_equal_fields(read, expected)
+
+
+def test_locus_reads_insertion_leading_soft_clip():
+    # one base is inserted between reference positions 11 and 12 after
+    # two soft-clipped bases
+    pysam_read = make_soft_clipped_pysam_read(seq="TTACGTT", cigar="2S2M1I2M")
+
+    read = get_single_locus_read(
+        pysam_read, 12, 12, use_soft_clipped_bases=False)
+    expected = LocusRead(
+        name=pysam_read.qname,
+        sequence="ACGTT",
+        reference_positions=[10, 11, None, 12, 13],
+        quality_scores=array("B", [22, 23, 24, 25, 26]),
+        reference_base0_start_inclusive=12,
+        reference_base0_end_exclusive=12,
+        read_base0_start_inclusive=2,
+        read_base0_end_exclusive=3)
+    assert_equal_fields(read, expected)
+
+    read = get_single_locus_read(
+        pysam_read, 12, 12, use_soft_clipped_bases=True)
+    expected = LocusRead(
+        name=pysam_read.qname,
+        sequence="TTACGTT",
+        reference_positions=[None, None, 10, 11, None, 12, 13],
+        quality_scores=array("B", [20, 21, 22, 23, 24, 25, 26]),
+        reference_base0_start_inclusive=12,
+        reference_base0_end_exclusive=12,
+        read_base0_start_inclusive=4,
+        read_base0_end_exclusive=5)
+    assert_equal_fields(read, expected)
+
+
+def test_locus_reads_insertion_trailing_soft_clip():
+    # one base is inserted between reference positions 11 and 12 and the
+    # last two bases are soft-clipped
+    pysam_read = make_soft_clipped_pysam_read(seq="ACGTTGG", cigar="2M1I2M2S")
+
+    read = get_single_locus_read(
+        pysam_read, 12, 12, use_soft_clipped_bases=False)
+    expected = LocusRead(
+        name=pysam_read.qname,
+        sequence="ACGTT",
+        reference_positions=[10, 11, None, 12, 13],
+        quality_scores=array("B", [20, 21, 22, 23, 24]),
+        reference_base0_start_inclusive=12,
+        reference_base0_end_exclusive=12,
+        read_base0_start_inclusive=2,
+        read_base0_end_exclusive=3)
+    assert_equal_fields(read, expected)
+
+    read = get_single_locus_read(
+        pysam_read, 12, 12, use_soft_clipped_bases=True)
+    expected = LocusRead(
+        name=pysam_read.qname,
+        sequence="ACGTTGG",
+        reference_positions=[10, 11, None, 12, 13, None, None],
+        quality_scores=array("B", [20, 21, 22, 23, 24, 25, 26]),
+        reference_base0_start_inclusive=12,
+        reference_base0_end_exclusive=12,
+        read_base0_start_inclusive=2,
+        read_base0_end_exclusive=3)
+    assert_equal_fields(read, expected)
+
+
+def get_locus_reads_for_single_read(
+        seq,
+        cigar,
+        reference_start,
+        base0_start_inclusive,
+        base0_end_exclusive):
+    pysam_read = make_pysam_read(
+        seq=seq,
+        cigar=cigar,
+        reference_start=reference_start)
+    samfile = MockAlignmentFile(
+        references=("chromosome",),
+        reads=[pysam_read])
+    read_creator = ReadCollector()
+    return read_creator.get_locus_reads(
+        samfile,
+        "chromosome",
+        base0_start_inclusive,
+        base0_end_exclusive)
+
+
+def check_locus_read_interval(
+        reads,
+        read_base0_start_inclusive,
+        read_base0_end_exclusive):
+    assert len(reads) == 1, \
+        "Expected to get back one read but instead got %d" % (
+            len(reads),)
+    read = reads[0]
+    eq_(read.read_base0_start_inclusive, read_base0_start_inclusive)
+    eq_(read.read_base0_end_exclusive, read_base0_end_exclusive)
+
+
+def test_locus_reads_span_ends_at_last_base_of_locus():
+    # read aligned to reference positions 10-13, locus is positions 12-13
+    reads = get_locus_reads_for_single_read(
+        seq="ACGT", cigar="4M", reference_start=10,
+        base0_start_inclusive=12, base0_end_exclusive=14)
+    check_locus_read_interval(reads, 2, 4)
+
+
+def test_locus_reads_span_ends_at_end_of_locus():
+    # read aligned to reference positions 11-14, locus is positions 12-13
+    reads = get_locus_reads_for_single_read(
+        seq="ACGT", cigar="4M", reference_start=11,
+        base0_start_inclusive=12, base0_end_exclusive=14)
+    check_locus_read_interval(reads, 1, 3)
+
+
+def test_locus_reads_span_ends_before_last_base_of_locus():
+    # read aligned to reference positions 9-12 doesn't reach position 13
+    reads = get_locus_reads_for_single_read(
+        seq="ACGT", cigar="4M", reference_start=9,
+        base0_start_inclusive=12, base0_end_exclusive=14)
+    eq_(reads, [])
+
+
+def test_locus_reads_span_starts_at_locus():
+    # read aligned to reference positions 12-15, locus is positions 12-13
+    reads = get_locus_reads_for_single_read(
+        seq="ACGT", cigar="4M", reference_start=12,
+        base0_start_inclusive=12, base0_end_exclusive=14)
+    check_locus_read_interval(reads, 0, 2)
+
+
+def test_locus_reads_span_starts_after_locus_start():
+    # read aligned to reference positions 13-16 is missing position 12
+    # and the position before it
+    reads = get_locus_reads_for_single_read(
+        seq="ACGT", cigar="4M", reference_start=13,
+        base0_start_inclusive=12, base0_end_exclusive=14)
+    eq_(reads, [])
+
+
+def test_locus_reads_insertion_flanking_bases_on_read_edges():
+    # insertion between reference positions 11 and 12, which are
+    # the first and last bases of the read
+    reads = get_locus_reads_for_single_read(
+        seq="AC", cigar="2M", reference_start=11,
+        base0_start_inclusive=12, base0_end_exclusive=12)
+    check_locus_read_interval(reads, 1, 1)
+
+    reads = get_locus_reads_for_single_read(
+        seq="AGC", cigar="1M1I1M", reference_start=11,
+        base0_start_inclusive=12, base0_end_exclusive=12)
+    check_locus_read_interval(reads, 1, 2)
+
+
+def test_locus_reads_insertion_missing_flanking_base():
+    # read ends at reference position 11, before the insertion point
+    reads = get_locus_reads_for_single_read(
+        seq="ACGT", cigar="4M", reference_start=8,
+        base0_start_inclusive=12, base0_end_exclusive=12)
+    eq_(reads, [])
+
+    # read starts at reference position 12, after the insertion point
+    reads = get_locus_reads_for_single_read(
+        seq="ACGT", cigar="4M", reference_start=12,
+        base0_start_inclusive=12, base0_end_exclusive=12)
+    eq_(reads, [])
+
+
+def make_flagged_pysam_reads():
+    """
+    Reads at the SNV locus chr1:4 with one of each FLAG bit which can
+    cause a read to be excluded, plus reads whose FLAG bits should never
+    cause them to be dropped.
+    """
+    flags = [
+        ("primary", 0),
+        ("paired", 0x1 | 0x2 | 0x40),
+        ("reverse", 0x10),
+        ("qcfail", 0x200),
+        ("supplementary", 0x800),
+        ("unmapped", 0x4),
+        ("secondary", 0x100),
+        ("duplicate", 0x400),
+    ]
+    pysam_reads = []
+    for name, flag in flags:
+        pysam_read = make_pysam_read(
+            seq="ACCGTG",
+            cigar="6M",
+            mdtag="3G2",
+            name=name)
+        pysam_read.flag = flag
+        pysam_reads.append(pysam_read)
+    return pysam_reads
+
+
+def get_locus_read_names_with_flags(
+        use_secondary_alignments,
+        use_duplicate_reads):
+    samfile = MockAlignmentFile(
+        references=("chromosome",),
+        reads=make_flagged_pysam_reads())
+    read_creator = ReadCollector(
+        use_secondary_alignments=use_secondary_alignments,
+        use_duplicate_reads=use_duplicate_reads)
+    reads = read_creator.get_locus_reads(samfile, "chromosome", 3, 4)
+    return {read.name for read in reads}
+
+
+KEPT_FLAGGED_READ_NAMES = {
+    "primary",
+    "paired",
+    "reverse",
+    "qcfail",
+    "supplementary",
+}
+
+
+def test_locus_reads_flags_exclude_secondary_and_duplicate():
+    eq_(
+        get_locus_read_names_with_flags(
+            use_secondary_alignments=False,
+            use_duplicate_reads=False),
+        KEPT_FLAGGED_READ_NAMES)
+
+
+def test_locus_reads_flags_use_secondary_alignments():
+    eq_(
+        get_locus_read_names_with_flags(
+            use_secondary_alignments=True,
+            use_duplicate_reads=False),
+        KEPT_FLAGGED_READ_NAMES | {"secondary"})
+
+
+def test_locus_reads_flags_use_duplicate_reads():
+    eq_(
+        get_locus_read_names_with_flags(
+            use_secondary_alignments=False,
+            use_duplicate_reads=True),
+        KEPT_FLAGGED_READ_NAMES | {"duplicate"})
+
+
+def test_locus_reads_flags_unmapped_always_dropped():
+    eq_(
+        get_locus_read_names_with_flags(
+            use_secondary_alignments=True,
+            use_duplicate_reads=True),
+        KEPT_FLAGGED_READ_NAMES | {"secondary", "duplicate"})
+
+
 def test_locus_reads_dataframe():
     sam_all_variants = load_bam("data/b16.f10/b16.combined.bam")
 